@@ -4,7 +4,6 @@ Main Streamlit Application Entry Point
 """
 
 import streamlit as st
-from modules import registration, voting, results, dsa_dashboard, admin
 
 # Page configuration
 st.set_page_config(
@@ -95,26 +94,33 @@ def main():
 
     st.markdown("---")
 
-    # Route to appropriate page
+    # Route to appropriate page; page modules are imported on first visit
     if choice == "🏠 Home":
+        from modules import registration
         registration.display_home()
 
     elif choice == "📝 Voter Registration":
+        from modules import registration
         registration.voter_registration_page()
 
     elif choice == "🎯 Candidate Registration":
+        from modules import registration
         registration.candidate_registration_page()
 
     elif choice == "🗳️ Cast Vote":
+        from modules import voting
         voting.cast_vote_page()
 
     elif choice == "📊 Results & Analytics":
+        from modules import results
         results.results_dashboard()
 
     elif choice == "🧮 DSA Dashboard":
+        from modules import dsa_dashboard
         dsa_dashboard.display_dashboard()
 
     elif choice == "🔐 Admin Panel":
+        from modules import admin
         admin.admin_panel_page()
 
     # Footer
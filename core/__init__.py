@@ -1,11 +1,11 @@
 """Core module initialization"""
 
-from .data_structures import HashTable, Trie, SegmentTree, TrieNode
+from .data_structures import HashTable, Trie, FenwickTree, SegmentTree, TrieNode, Leaderboard
 from .security import SecurityManager
 from .persistence import DataPersistence
 from .utils import *
 
 __all__ = [
-    'HashTable', 'Trie', 'SegmentTree', 'TrieNode',
+    'HashTable', 'Trie', 'FenwickTree', 'SegmentTree', 'TrieNode', 'Leaderboard',
     'SecurityManager', 'DataPersistence'
 ]
@@ -1,87 +1,133 @@
 """
 Data Structures Module
-Implements custom HashTable, Trie, and SegmentTree from scratch
+Implements HashTable, Trie, FenwickTree, and Leaderboard
 """
 
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter
+from threading import RLock
+
+_SENTINEL = object()
+
+
 class HashTable:
-    """Custom Hash Table implementation with chaining for collision resolution"""
+    """Hash Table backed by Python's built-in dict, with chaining statistics simulated on demand"""
+
+    MAX_LOAD_FACTOR = 0.7
 
     def __init__(self, size=100):
-        self.size = size
-        self.table = [[] for _ in range(size)]
-        self.count = 0
-        self.collision_count = 0
+        # Round up to a power of two so bucket indexing is a bitmask instead of a modulo
+        self.size = 1 << max(0, size - 1).bit_length()
+        self._mask = self.size - 1
+        self._data = {}
+        # Bumped whenever the key set changes; get_stats() is memoized against it
+        self._version = 0
+        self._stats_cache = None
+
+    @property
+    def count(self):
+        """Number of stored items"""
+        return len(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    @property
+    def collision_count(self):
+        """Number of keys sharing a bucket with an earlier key"""
+        return self.get_stats()['collisions']
 
     def _hash(self, key):
-        """Generate hash value for a key"""
-        return hash(str(key)) % self.size
+        """Generate bucket index for a key"""
+        return hash(key) & self._mask
 
     def insert(self, key, value):
         """Insert or update key-value pair"""
-        index = self._hash(key)
-
-        # Check if key already exists
-        for i, (k, v) in enumerate(self.table[index]):
-            if k == key:
-                self.table[index][i] = (key, value)
-                return
-
-        # Track collisions
-        if len(self.table[index]) > 0:
-            self.collision_count += 1
-
-        self.table[index].append((key, value))
-        self.count += 1
+        if key not in self._data:
+            self._version += 1
+        self._data[key] = value
+
+        if self.count > self.size * self.MAX_LOAD_FACTOR:
+            self._resize(self.size * 2)
+
+    def bulk_insert(self, pairs):
+        """Insert or update many key-value pairs, growing the table once at the end"""
+        before = len(self._data)
+        self._data.update(pairs)
+        # Updates of existing keys leave the key set unchanged, so only growth invalidates stats
+        if len(self._data) != before:
+            self._version += 1
+
+        new_size = self.size
+        while self.count > new_size * self.MAX_LOAD_FACTOR:
+            new_size *= 2
+        if new_size != self.size:
+            self._resize(new_size)
+
+    def _resize(self, new_size):
+        """Grow the bucket count; bucket indices are derived lazily so no rehash pass is needed"""
+        self.size = new_size
+        self._mask = new_size - 1
 
     def get(self, key):
         """Retrieve value by key"""
-        index = self._hash(key)
-        for k, v in self.table[index]:
-            if k == key:
-                return v
-        return None
+        return self._data.get(key)
 
     def delete(self, key):
         """Delete key-value pair"""
-        index = self._hash(key)
-        for i, (k, v) in enumerate(self.table[index]):
-            if k == key:
-                del self.table[index][i]
-                self.count -= 1
-                return True
-        return False
+        if self._data.pop(key, _SENTINEL) is _SENTINEL:
+            return False
+        self._version += 1
+        return True
 
     def contains(self, key):
         """Check if key exists"""
-        return self.get(key) is not None
+        return key in self._data
 
     def get_all(self):
         """Return all key-value pairs as dictionary"""
-        result = {}
-        for bucket in self.table:
-            for key, value in bucket:
-                result[key] = value
-        return result
+        return dict(self._data)
+
+    def keys(self):
+        """Return all keys as a list, without copying the values"""
+        return list(self._data)
+
+    def items(self):
+        """Return a snapshot list of (key, value) pairs, safe to iterate while other threads insert"""
+        # list() copies the pairs in one step without releasing the GIL; a live view would not be
+        return list(self._data.items())
+
+    def __iter__(self):
+        """Iterate over a snapshot of the (key, value) pairs"""
+        return iter(self.items())
 
     def get_load_factor(self):
         """Calculate load factor (items per bucket)"""
         return self.count / self.size if self.size > 0 else 0
 
     def get_stats(self):
-        """Get hash table statistics"""
-        bucket_sizes = [len(bucket) for bucket in self.table]
-        max_chain_length = max(bucket_sizes) if bucket_sizes else 0
-        empty_buckets = sum(1 for size in bucket_sizes if size == 0)
+        """Get hash table statistics, simulating the bucket distribution of a chained table"""
+        if self._stats_cache is not None and self._stats_cache[0] == self._version:
+            return self._stats_cache[1]
 
-        return {
+        # One counting pass over the keys; only occupied buckets appear in the Counter
+        mask = self._mask
+        chain_lengths = Counter(hash(key) & mask for key in self.keys())
+        max_chain_length = max(chain_lengths.values(), default=0)
+        empty_buckets = self.size - len(chain_lengths)
+
+        stats = {
             'total_items': self.count,
             'table_size': self.size,
             'load_factor': self.get_load_factor(),
-            'collisions': self.collision_count,
+            'collisions': self.count - (self.size - empty_buckets),
             'max_chain_length': max_chain_length,
             'empty_buckets': empty_buckets,
             'utilization': ((self.size - empty_buckets) / self.size * 100) if self.size > 0 else 0
         }
+        self._stats_cache = (self._version, stats)
+        return stats
 
     def to_dict(self):
         """Convert to dictionary for JSON serialization"""
@@ -89,30 +135,39 @@ class HashTable:
 
     def from_dict(self, data):
         """Load from dictionary"""
-        for key, value in data.items():
-            self.insert(key, value)
+        self.bulk_insert(data.items())
 
 
 class TrieNode:
     """Node for Trie data structure"""
 
+    __slots__ = ('children', 'is_end_of_word', 'data', 'word')
+
     def __init__(self):
         self.children = {}
         self.is_end_of_word = False
         self.data = None
+        self.word = None
 
 
 class Trie:
     """Prefix Tree for efficient candidate name search and autocomplete"""
 
+    PREFIX_CACHE_SIZE = 256
+
     def __init__(self):
         self.root = TrieNode()
         self.word_count = 0
+        # Maintained on insert so get_stats() never walks the tree (words are never removed)
+        self.max_depth = 0
+        # Lowercased prefix -> starts_with results, cleared whenever the trie changes
+        self._prefix_cache = {}
 
     def insert(self, word, data=None):
         """Insert word into Trie with optional associated data"""
         node = self.root
         word = word.lower()
+        self._prefix_cache.clear()
 
         for char in word:
             if char not in node.children:
@@ -121,8 +176,10 @@ class Trie:
 
         if not node.is_end_of_word:
             self.word_count += 1
+            self.max_depth = max(self.max_depth, len(word))
         node.is_end_of_word = True
         node.data = data
+        node.word = word
 
     def search(self, word):
         """Search for exact word in Trie"""
@@ -131,13 +188,20 @@ class Trie:
 
     def starts_with(self, prefix):
         """Find all words starting with prefix"""
-        node = self._find_node(prefix.lower())
-        if not node:
-            return []
+        prefix = prefix.lower()
+        cached = self._prefix_cache.get(prefix)
+        if cached is not None:
+            return list(cached)
 
+        node = self._find_node(prefix)
         results = []
-        self._collect_words(node, prefix.lower(), results)
-        return results
+        if node:
+            self._collect_words(node, results)
+
+        if len(self._prefix_cache) >= self.PREFIX_CACHE_SIZE:
+            self._prefix_cache.clear()
+        self._prefix_cache[prefix] = results
+        return list(results)
 
     def _find_node(self, prefix):
         """Find node corresponding to prefix"""
@@ -148,82 +212,119 @@ class Trie:
             node = node.children[char]
         return node
 
-    def _collect_words(self, node, prefix, results):
-        """Recursively collect all words from node"""
-        if node.is_end_of_word:
-            results.append({'word': prefix, 'data': node.data})
+    def _collect_words(self, node, results):
+        """Collect all words below node in depth-first order using an explicit stack"""
+        # Terminal nodes store their word, so no prefix strings are built during the walk
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.is_end_of_word:
+                results.append({'word': node.word, 'data': node.data})
 
-        for char, child_node in node.children.items():
-            self._collect_words(child_node, prefix + char, results)
+            # Push children in reverse so they are visited in insertion order
+            stack.extend(reversed(node.children.values()))
 
     def get_stats(self):
         """Get Trie statistics"""
         return {
             'total_words': self.word_count,
-            'max_depth': self._get_max_depth(self.root, 0)
+            'max_depth': self.max_depth
         }
 
-    def _get_max_depth(self, node, depth):
-        """Calculate maximum depth of Trie"""
-        if not node.children:
-            return depth
-        return max(self._get_max_depth(child, depth + 1) for child in node.children.values())
-
 
-class SegmentTree:
-    """Segment Tree for range query operations (demo structure)"""
+class FenwickTree:
+    """Fenwick Tree (Binary Indexed Tree) for range sum queries (demo structure)"""
 
     def __init__(self, arr):
         self.n = len(arr)
-        self.tree = [0] * (4 * self.n)
-        if arr:
-            self._build(arr, 0, 0, self.n - 1)
-
-    def _build(self, arr, node, start, end):
-        """Build segment tree from array"""
-        if start == end:
-            self.tree[node] = arr[start]
-            return
-
-        mid = (start + end) // 2
-        self._build(arr, 2 * node + 1, start, mid)
-        self._build(arr, 2 * node + 2, mid + 1, end)
-        self.tree[node] = self.tree[2 * node + 1] + self.tree[2 * node + 2]
+        self.values = list(arr)
+        self.tree = [0] * (self.n + 1)
+
+        # O(N) build: each node passes its partial sum up to its parent
+        for i, value in enumerate(self.values, 1):
+            self.tree[i] += value
+            parent = i + (i & -i)
+            if parent <= self.n:
+                self.tree[parent] += self.tree[i]
+
+    def _prefix_sum(self, index):
+        """Sum of values in [0, index]"""
+        total = 0
+        i = index + 1
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
 
     def query(self, left, right):
         """Query sum in range [left, right]"""
-        if self.n == 0:
+        left = max(left, 0)
+        right = min(right, self.n - 1)
+        if left > right:
             return 0
-        return self._query(0, 0, self.n - 1, left, right)
-
-    def _query(self, node, start, end, left, right):
-        """Recursive range query"""
-        if right < start or left > end:
-            return 0
-        if left <= start and end <= right:
-            return self.tree[node]
-
-        mid = (start + end) // 2
-        left_sum = self._query(2 * node + 1, start, mid, left, right)
-        right_sum = self._query(2 * node + 2, mid + 1, end, left, right)
-        return left_sum + right_sum
+        return self._prefix_sum(right) - self._prefix_sum(left - 1)
 
     def update(self, index, value):
         """Update value at index"""
-        if self.n == 0:
-            return
-        self._update(0, 0, self.n - 1, index, value)
-
-    def _update(self, node, start, end, index, value):
-        """Recursive update"""
-        if start == end:
-            self.tree[node] = value
-            return
-
-        mid = (start + end) // 2
-        if index <= mid:
-            self._update(2 * node + 1, start, mid, index, value)
-        else:
-            self._update(2 * node + 2, mid + 1, end, index, value)
-
-        self.tree[node] = self.tree[2 * node + 1] + self.tree[2 * node + 2]
+        # A negative index would make the update loop start at 0, where i & -i never advances
+        if not 0 <= index < self.n:
+            raise ValueError(f"index {index} out of range for FenwickTree of size {self.n}")
+        delta = value - self.values[index]
+        self.values[index] = value
+
+        i = index + 1
+        while i <= self.n:
+            self.tree[i] += delta
+            i += i & -i
+
+
+class Leaderboard:
+    """Candidate IDs ranked by votes (descending), kept sorted incrementally with binary search
+
+    Each candidate gets a compact index in registration order; vote counts live in a
+    contiguous int64 array at that index. Ties keep registration order, matching a
+    stable sort of the candidates by votes. Methods are atomic, so one instance can be
+    shared between threads.
+    """
+
+    def __init__(self):
+        self._index = {}            # candidate_id -> compact index
+        self._ids = []              # compact index -> candidate_id
+        self.votes = array('q')     # compact index -> vote count
+        self._entries = []          # sorted (-votes, index) pairs
+        # Reentrant because increment() calls update()
+        self._lock = RLock()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def update(self, candidate_id, votes):
+        """Add a candidate or move it to the position for its new vote count in O(log N) comparisons"""
+        with self._lock:
+            idx = self._index.get(candidate_id)
+            if idx is None:
+                idx = self._index[candidate_id] = len(self._ids)
+                self._ids.append(candidate_id)
+                self.votes.append(votes)
+            else:
+                del self._entries[bisect_left(self._entries, (-self.votes[idx], idx))]
+                self.votes[idx] = votes
+
+            insort(self._entries, (-votes, idx))
+
+    def increment(self, candidate_id):
+        """Count one vote for a registered candidate and return its new total"""
+        with self._lock:
+            votes = self.votes[self._index[candidate_id]] + 1
+            self.update(candidate_id, votes)
+            return votes
+
+    def top(self, n=None):
+        """Return the IDs of the top n candidates (all of them when n is None)"""
+        with self._lock:
+            ids = self._ids
+            return [ids[idx] for _, idx in self._entries[:n]]
+
+
+# Backwards-compatible name for the range-sum structure
+SegmentTree = FenwickTree
@@ -8,12 +8,59 @@ import os
 import gzip
 import shutil
 from datetime import datetime
+from threading import RLock
+
+try:
+    import orjson
+except ImportError:  # optional accelerator; fall back to the standard library
+    orjson = None
+
+# Backups favour speed over ratio: level 1 is several times faster than gzip's default of 9
+BACKUP_COMPRESSLEVEL = 1
+COPY_BUFFER_SIZE = 1 << 20
+
+# Changed records are appended to <name>.log.jsonl and folded back into <name>.json after this many lines
+LOG_SUFFIX = '.log.jsonl'
+COMPACT_THRESHOLD = 500
+
+# Private cache of {filename: [mtime_ns, size, record_count]}; kept out of metadata.json and backups
+RECORD_COUNTS_FILE = '.record_counts.json'
+
+
+def _dumps(data):
+    """Encode data as indented JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode()
+
+
+def _dumps_line(data):
+    """Encode data as a single line of compact JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode()
+
+
+def _loads(raw):
+    """Decode JSON bytes"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 
 class DataPersistence:
     """Manages file-based data persistence with backup support"""
 
     def __init__(self, data_dir='data'):
         self.data_dir = data_dir
+        # filename -> ((mtime_ns, size), record_count), so unchanged files are not re-parsed
+        self._stats_cache = {}
+        # filename -> lines in its change log, counted from disk on first use
+        self._log_lengths = {}
+        # filename -> lock serialising appends, compaction and full saves of that file
+        self._file_locks = {}
+        # Contents of RECORD_COUNTS_FILE, loaded on first use
+        self._counts = None
         self.ensure_data_directory()
 
     def ensure_data_directory(self):
@@ -25,29 +72,174 @@ class DataPersistence:
         """Get full path for data file"""
         return os.path.join(self.data_dir, filename)
 
+    def get_log_path(self, filename):
+        """Get full path for the append-only change log of a data file"""
+        return self.get_file_path(filename.replace('.json', LOG_SUFFIX))
+
+    def _lock(self, filename):
+        """Per-file lock; reentrant because append_record may compact and compact saves"""
+        # dict.setdefault is atomic, so concurrent sessions always share one lock per file
+        return self._file_locks.setdefault(filename, RLock())
+
     def save_data(self, filename, data):
-        """Save data to JSON file"""
+        """Save data to JSON file, superseding any pending change log"""
         try:
             filepath = self.get_file_path(filename)
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2)
+            with self._lock(filename):
+                with open(filepath, 'wb') as f:
+                    f.write(_dumps(data))
+                self._discard_log(filename)
+                if isinstance(data, dict):
+                    self._remember_record_count(filename, len(data))
             return True
         except Exception as e:
             print(f"Error saving {filename}: {e}")
             return False
 
+    def _read_base(self, filename):
+        """Read a JSON file without its change log, raising if it cannot be parsed"""
+        filepath = self.get_file_path(filename)
+        if not os.path.exists(filepath):
+            return {}
+        with open(filepath, 'rb') as f:
+            return _loads(f.read())
+
+    def _read(self, filename):
+        """Read a JSON file and replay its change log on top, raising if the file cannot be parsed"""
+        data = self._read_base(filename)
+        log_path = self.get_log_path(filename)
+        if isinstance(data, dict) and os.path.exists(log_path):
+            with open(log_path, 'rb') as f:
+                for line in f:
+                    try:
+                        key, value = _loads(line)
+                    except ValueError:
+                        # A torn final line from an interrupted write; earlier lines are intact
+                        continue
+                    data[key] = value
+        return data
+
     def load_data(self, filename):
-        """Load data from JSON file"""
+        """Load data from JSON file and replay its change log on top"""
         try:
-            filepath = self.get_file_path(filename)
-            if os.path.exists(filepath):
-                with open(filepath, 'r') as f:
-                    return json.load(f)
-            return {}
+            return self._read(filename)
         except Exception as e:
             print(f"Error loading {filename}: {e}")
             return {}
 
+    def append_record(self, filename, key, value):
+        """Persist a single new or changed record without rewriting the whole file"""
+        try:
+            log_path = self.get_log_path(filename)
+            with self._lock(filename):
+                if filename not in self._log_lengths:
+                    # A line torn by a crash would swallow the next record, so cut it off first;
+                    # the lines that remain seed the compaction threshold across restarts
+                    self._truncate_torn_tail(log_path)
+                    self._log_lengths[filename] = self._count_log_lines(log_path)
+                try:
+                    with open(log_path, 'ab') as f:
+                        f.write(_dumps_line([key, value]) + b'\n')
+                except Exception:
+                    # The write may have stopped mid-line; check the tail again next time
+                    self._log_lengths.pop(filename, None)
+                    raise
+                self._log_lengths[filename] += 1
+                if self._log_lengths[filename] >= COMPACT_THRESHOLD:
+                    self.compact(filename)
+            return True
+        except Exception as e:
+            print(f"Error appending to {filename}: {e}")
+            return False
+
+    def compact(self, filename):
+        """Fold the change log of a data file back into the JSON file
+
+        If the file cannot be read, both it and its log are left untouched and False is returned.
+        """
+        with self._lock(filename):
+            if not os.path.exists(self.get_log_path(filename)):
+                return True
+            try:
+                data = self._read(filename)
+            except Exception as e:
+                print(f"Error compacting {filename}: {e}")
+                return False
+            return self.save_data(filename, data)
+
+    def count_records(self, filename):
+        """Count the records of an append-only data file (such as votes.json) without parsing it
+
+        The JSON file's record count is remembered in a private sidecar whenever it is saved,
+        keyed by the file's mtime and size; every complete change-log line is taken to be a new
+        record.
+        """
+        filepath = self.get_file_path(filename)
+        with self._lock(filename):
+            base_count = 0
+            if os.path.exists(filepath):
+                file_stat = os.stat(filepath)
+                signature = [file_stat.st_mtime_ns, file_stat.st_size]
+                entry = self._record_counts().get(filename)
+                if entry and entry[:2] == signature:
+                    base_count = entry[2]
+                else:
+                    # Written by a different run or restored from a backup: count it once and remember
+                    data = self._read_base(filename)
+                    base_count = len(data) if isinstance(data, dict) else 0
+                    self._remember_record_count(filename, base_count)
+            return base_count + self._count_log_lines(self.get_log_path(filename))
+
+    def _record_counts(self):
+        """Record counts remembered by this or an earlier run, read from the sidecar once"""
+        if self._counts is None:
+            try:
+                with open(self.get_file_path(RECORD_COUNTS_FILE), 'rb') as f:
+                    self._counts = _loads(f.read())
+            except (OSError, ValueError):
+                self._counts = {}
+        return self._counts
+
+    def _remember_record_count(self, filename, record_count):
+        """Store the record count of a just-written JSON file in the sidecar"""
+        file_stat = os.stat(self.get_file_path(filename))
+        with self._lock(RECORD_COUNTS_FILE):
+            counts = self._record_counts()
+            counts[filename] = [file_stat.st_mtime_ns, file_stat.st_size, record_count]
+            with open(self.get_file_path(RECORD_COUNTS_FILE), 'wb') as f:
+                f.write(_dumps_line(counts))
+
+    @staticmethod
+    def _count_log_lines(log_path):
+        """Number of complete lines in a change log (0 if there is none)"""
+        if not os.path.exists(log_path):
+            return 0
+        with open(log_path, 'rb') as f:
+            return sum(1 for line in f if line.endswith(b'\n'))
+
+    @staticmethod
+    def _truncate_torn_tail(log_path):
+        """Drop a partial last line from a change log so appends start on a fresh line"""
+        if not os.path.exists(log_path):
+            return
+        with open(log_path, 'rb+') as f:
+            end = f.seek(0, os.SEEK_END)
+            if end == 0:
+                return
+            f.seek(end - 1)
+            if f.read(1) == b'\n':
+                return
+            f.seek(0)
+            keep = f.read().rfind(b'\n') + 1
+            f.truncate(keep)
+
+    def _discard_log(self, filename):
+        """Remove the change log of a data file once the JSON file holds its contents"""
+        log_path = self.get_log_path(filename)
+        if os.path.exists(log_path):
+            os.remove(log_path)
+        self._log_lengths[filename] = 0
+
     def create_backup(self):
         """Create compressed backup of all data files"""
         try:
@@ -61,23 +253,32 @@ class DataPersistence:
             files_to_backup = ['voters.json', 'candidates.json', 'votes.json', 'metadata.json']
 
             backup_count = 0
+            uncompacted = []
             for filename in files_to_backup:
                 filepath = self.get_file_path(filename)
-                if os.path.exists(filepath):
-                    backup_filename = f"{filename.replace('.json', '')}_{timestamp}.json.gz"
-                    backup_path = os.path.join(backup_dir, backup_filename)
-
-                    with open(filepath, 'rb') as f_in:
-                        with gzip.open(backup_path, 'wb') as f_out:
-                            shutil.copyfileobj(f_in, f_out)
-                    backup_count += 1
+                # Hold the file's lock so no record lands in the log between compaction and the copy
+                with self._lock(filename):
+                    if not self.compact(filename):
+                        uncompacted.append(filename)
+                    if os.path.exists(filepath):
+                        backup_filename = f"{filename.replace('.json', '')}_{timestamp}.json.gz"
+                        backup_path = os.path.join(backup_dir, backup_filename)
+
+                        with open(filepath, 'rb') as f_in:
+                            with gzip.open(backup_path, 'wb', compresslevel=BACKUP_COMPRESSLEVEL) as f_out:
+                                shutil.copyfileobj(f_in, f_out, COPY_BUFFER_SIZE)
+                        backup_count += 1
 
             # Update metadata
-            metadata = self.load_data('metadata.json')
-            metadata['last_backup'] = timestamp
-            metadata['backup_count'] = metadata.get('backup_count', 0) + 1
-            self.save_data('metadata.json', metadata)
-
+            with self._lock('metadata.json'):
+                metadata = self.load_data('metadata.json')
+                metadata['last_backup'] = timestamp
+                metadata['backup_count'] = metadata.get('backup_count', 0) + 1
+                self.save_data('metadata.json', metadata)
+
+            if uncompacted:
+                return False, (f"Backed up {backup_count} files, but could not read {', '.join(uncompacted)}; "
+                               "their pending changes are not in the backup")
             return True, f"Backed up {backup_count} files"
         except Exception as e:
             return False, f"Backup failed: {e}"
@@ -96,9 +297,11 @@ class DataPersistence:
                 if os.path.exists(backup_path):
                     restore_path = self.get_file_path(f"{filename}.json")
 
-                    with gzip.open(backup_path, 'rb') as f_in:
-                        with open(restore_path, 'wb') as f_out:
-                            shutil.copyfileobj(f_in, f_out)
+                    with self._lock(f"{filename}.json"):
+                        self._discard_log(f"{filename}.json")
+                        with gzip.open(backup_path, 'rb') as f_in:
+                            with open(restore_path, 'wb') as f_out:
+                                shutil.copyfileobj(f_in, f_out, COPY_BUFFER_SIZE)
                     restored_count += 1
 
             return True, f"Restored {restored_count} files"
@@ -136,12 +339,22 @@ class DataPersistence:
         for filename in files:
             filepath = self.get_file_path(filename)
             if os.path.exists(filepath):
-                size = os.path.getsize(filepath)
-                modified = datetime.fromtimestamp(os.path.getmtime(filepath))
-
-                # Count records
-                data = self.load_data(filename)
-                record_count = len(data) if isinstance(data, dict) else 0
+                file_stat = os.stat(filepath)
+                size = file_stat.st_size
+                modified = datetime.fromtimestamp(file_stat.st_mtime)
+
+                # Count records, re-parsing only when the file or its change log has changed
+                log_path = self.get_log_path(filename)
+                log_stat = os.stat(log_path) if os.path.exists(log_path) else None
+                signature = (file_stat.st_mtime_ns, size,
+                             log_stat and (log_stat.st_mtime_ns, log_stat.st_size))
+                cached = self._stats_cache.get(filename)
+                if cached is not None and cached[0] == signature:
+                    record_count = cached[1]
+                else:
+                    data = self.load_data(filename)
+                    record_count = len(data) if isinstance(data, dict) else 0
+                    self._stats_cache[filename] = (signature, record_count)
 
                 stats[filename] = {
                     'size': size,
@@ -159,23 +372,32 @@ class DataPersistence:
 
         return stats
 
-    def export_to_csv(self, data, filename):
-        """Export data to CSV format"""
+    def export_to_csv(self, data, filename, chunk_size=50_000):
+        """Export data to CSV format, streaming records to disk in batches of chunk_size
+
+        data is either a {key: record} dict or any iterable of record dicts.
+        """
         try:
             import csv
+            from itertools import chain, islice
             filepath = self.get_file_path(filename)
 
-            if not data:
+            records = iter(data.values() if isinstance(data, dict) else data)
+            first = next(records, None)
+            if first is None:
                 return False, "No data to export"
 
             # Get keys from first record
-            keys = list(list(data.values())[0].keys())
+            keys = list(first.keys())
 
+            records = chain([first], records)
             with open(filepath, 'w', newline='') as f:
                 writer = csv.DictWriter(f, fieldnames=keys)
                 writer.writeheader()
-                for record in data.values():
-                    writer.writerow(record)
+                chunk = list(islice(records, chunk_size))
+                while chunk:
+                    writer.writerows(chunk)
+                    chunk = list(islice(records, chunk_size))
 
             return True, f"Exported to {filename}"
         except Exception as e:
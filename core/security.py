@@ -4,57 +4,79 @@ Handles cryptographic operations and ID generation
 """
 
 import hashlib
-import random
+import hmac
+import secrets
 import string
 import time
 
+# Character class for each position after the 'V' prefix: 3 digits, 3 letters, 3 digits, 3 letters
+_VOTER_ID_ALPHABETS = (string.digits,) * 3 + (string.ascii_uppercase,) * 3 + \
+    (string.digits,) * 3 + (string.ascii_uppercase,) * 3
+_CANDIDATE_ID_ALPHABET = string.ascii_uppercase + string.digits
+
 class SecurityManager:
     """Manages security operations: hashing, ID generation, vote integrity"""
 
     def __init__(self):
         self.hash_algorithm = 'sha256'
+        # Translation table that deletes potentially dangerous characters in one pass
+        self._sanitize_table = str.maketrans('', '', '<>{};\\|')
 
     def generate_sha256(self, data):
         """Generate SHA-256 hash of data"""
-        return hashlib.sha256(str(data).encode()).hexdigest()
+        if isinstance(data, bytes):
+            return hashlib.sha256(data).hexdigest()
+        if not isinstance(data, str):
+            data = str(data)
+        return hashlib.sha256(data.encode()).hexdigest()
 
     def generate_voter_id(self):
         """Generate unique voter ID in format: V123ABC456DEF"""
         # Format: V + 3 digits + 3 uppercase letters + 3 digits + 3 uppercase letters
-        digits1 = ''.join(random.choices(string.digits, k=3))
-        letters1 = ''.join(random.choices(string.ascii_uppercase, k=3))
-        digits2 = ''.join(random.choices(string.digits, k=3))
-        letters2 = ''.join(random.choices(string.ascii_uppercase, k=3))
-
-        return f"V{digits1}{letters1}{digits2}{letters2}"
+        # secrets.choice draws uniformly from the OS CSPRNG (no modulo bias)
+        return 'V' + ''.join(secrets.choice(alphabet) for alphabet in _VOTER_ID_ALPHABETS)
 
     def generate_candidate_id(self):
         """Generate unique candidate ID in format: C + timestamp + random"""
         timestamp = str(int(time.time()))[-6:]
-        random_part = ''.join(random.choices(string.ascii_uppercase + string.digits, k=4))
+        random_part = ''.join(secrets.choice(_CANDIDATE_ID_ALPHABET) for _ in range(4))
         return f"C{timestamp}{random_part}"
 
     def hash_vote(self, voter_id, candidate_id, timestamp):
         """Create tamper-proof vote hash"""
-        vote_data = f"{voter_id}:{candidate_id}:{timestamp}"
-        return self.generate_sha256(vote_data)
+        vote_data = f"{voter_id}:{candidate_id}:{timestamp}".encode()
+        return hashlib.sha256(vote_data).hexdigest()
 
     def verify_vote_integrity(self, voter_id, candidate_id, timestamp, stored_hash):
         """Verify vote hasn't been tampered with"""
         computed_hash = self.hash_vote(voter_id, candidate_id, timestamp)
         return computed_hash == stored_hash
 
+    def verify_all_votes(self, votes):
+        """Verify every vote in a {vote_id: vote_data} mapping, returning IDs of tampered votes"""
+        # Copying a pre-initialised hasher is cheaper than constructing a new one per vote;
+        # the copy and append bound methods are looked up once, outside the loop
+        new_hasher = hashlib.sha256().copy
+        tampered = []
+        add_tampered = tampered.append
+        for vote_id, vote in votes.items():
+            hasher = new_hasher()
+            hasher.update(f"{vote['voter_id']}:{vote['candidate_id']}:{vote['timestamp']}".encode())
+            if hasher.hexdigest() != vote['vote_hash']:
+                add_tampered(vote_id)
+        return tampered
+
     def hash_password(self, password):
         """Hash password for secure storage"""
         return self.generate_sha256(password)
 
     def verify_password(self, password, stored_hash):
-        """Verify password against stored hash"""
-        return self.hash_password(password) == stored_hash
+        """Verify password against stored hash in constant time"""
+        return hmac.compare_digest(self.hash_password(password), stored_hash)
 
     def generate_session_token(self):
         """Generate random session token"""
-        return ''.join(random.choices(string.ascii_letters + string.digits, k=32))
+        return secrets.token_urlsafe(24)
 
     def validate_email(self, email):
         """Basic email validation"""
@@ -71,8 +93,4 @@ class SecurityManager:
     def sanitize_input(self, text):
         """Sanitize user input to prevent injection attacks"""
         # Remove potentially dangerous characters
-        dangerous_chars = ['<', '>', '{', '}', ';', '\\', '|']
-        sanitized = text
-        for char in dangerous_chars:
-            sanitized = sanitized.replace(char, '')
-        return sanitized.strip()
+        return text.translate(self._sanitize_table).strip()
@@ -6,10 +6,13 @@ Helper functions for validation, formatting, and calculations
 import re
 from datetime import datetime
 
+# Patterns compiled once at import time
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_VOTER_ID_RE = re.compile(r'^V\d{3}[A-Z]{3}\d{3}[A-Z]{3}$')
+
 def validate_email(email):
     """Validate email format"""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return _EMAIL_RE.match(email) is not None
 
 def validate_age(age):
     """Validate age is valid integer and >= 18"""
@@ -21,35 +24,41 @@ def validate_age(age):
 
 def validate_name(name):
     """Validate name contains only letters and spaces"""
-    return bool(name) and all(c.isalpha() or c.isspace() for c in name)
+    # Drop whitespace then check the rest in a single C-level isalpha() scan
+    return ''.join(name.split()).isalpha()
+
+def current_timestamp():
+    """Current local time as 'YYYY-MM-DD HH:MM:SS'"""
+    # isoformat() is equivalent to strftime('%Y-%m-%d %H:%M:%S') without the locale-aware formatting path
+    return datetime.now().isoformat(sep=' ', timespec='seconds')
 
-def format_voter_data(name, age, email, voter_id):
+def format_voter_data(name, age, email, voter_id, timestamp=None):
     """Format voter data for storage"""
     return {
         'voter_id': voter_id,
         'name': name.strip(),
         'age': int(age),
         'email': email.lower().strip(),
-        'registered_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'registered_at': timestamp or current_timestamp(),
         'has_voted': False
     }
 
-def format_candidate_data(name, party, candidate_id):
+def format_candidate_data(name, party, candidate_id, timestamp=None):
     """Format candidate data for storage"""
     return {
         'candidate_id': candidate_id,
         'name': name.strip(),
         'party': party.strip(),
-        'registered_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'registered_at': timestamp or current_timestamp(),
         'votes': 0
     }
 
-def format_vote_data(voter_id, candidate_id, vote_hash):
+def format_vote_data(voter_id, candidate_id, vote_hash, timestamp=None):
     """Format vote data for storage"""
     return {
         'voter_id': voter_id,
         'candidate_id': candidate_id,
-        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'timestamp': timestamp or current_timestamp(),
         'vote_hash': vote_hash
     }
 
@@ -65,15 +74,21 @@ def calculate_vote_percentage(candidate_votes, total_votes):
         return 0.0
     return round((candidate_votes / total_votes) * 100, 2)
 
-def sort_candidates_by_votes(candidates_dict):
-    """Sort candidates by votes in descending order using list and sorted()"""
-    # Convert dict to list of tuples
-    candidates_list = [(cid, data) for cid, data in candidates_dict.items()]
+def calculate_vote_percentages(vote_counts, total_votes):
+    """Calculate the vote percentage for each count, in one pass"""
+    if total_votes == 0:
+        return [0.0] * len(vote_counts)
+    return [round((votes / total_votes) * 100, 2) for votes in vote_counts]
 
-    # Sort using Python's sorted() - O(N log N)
-    sorted_list = sorted(candidates_list, key=lambda x: x[1].get('votes', 0), reverse=True)
+def _candidate_votes(item):
+    """Sort key for (candidate_id, data) pairs"""
+    return item[1].get('votes', 0)
 
-    return sorted_list
+def sort_candidates_by_votes(candidates_dict):
+    """Sort candidates by votes in descending order using list and sorted()"""
+    # Sort the (cid, data) items view directly using Python's sorted() - O(N log N);
+    # the key is evaluated once per candidate, not once per comparison
+    return sorted(candidates_dict.items(), key=_candidate_votes, reverse=True)
 
 def get_top_n_candidates(candidates_dict, n=3):
     """Get top N candidates by votes"""
@@ -119,21 +134,29 @@ def sanitize_string(text):
 
 def is_valid_voter_id_format(voter_id):
     """Check if voter ID matches expected format: V123ABC456DEF"""
-    pattern = r'^V\d{3}[A-Z]{3}\d{3}[A-Z]{3}$'
-    return re.match(pattern, voter_id) is not None
+    return _VOTER_ID_RE.match(voter_id) is not None
 
 def is_valid_candidate_id_format(candidate_id):
     """Check if candidate ID starts with C"""
     return candidate_id.startswith('C') and len(candidate_id) >= 5
 
-def get_system_stats(voters, candidates, votes):
-    """Calculate comprehensive system statistics"""
+def get_system_stats(voters, candidates, votes=None, voted_count=None, total_votes=None):
+    """Calculate comprehensive system statistics
+
+    candidates and votes only need a length. voters needs a length and, unless
+    voted_count is given, an items() method yielding (voter_id, record) pairs, as a
+    dict or HashTable has; records without 'has_voted' count as not voted. Pass
+    voted_count when it is already known (e.g. the size of the voted set) to skip
+    that scan, and total_votes in place of votes when the vote records are not loaded.
+    """
     total_voters = len(voters)
     total_candidates = len(candidates)
-    total_votes = len(votes)
+    if total_votes is None:
+        total_votes = len(votes)
 
-    # Count voters who have voted
-    voted_count = sum(1 for v in voters.values() if v.get('has_voted', False))
+    if voted_count is None:
+        # Count voters who have voted
+        voted_count = sum(1 for _, record in voters.items() if record.get('has_voted', False))
 
     turnout = calculate_turnout(total_voters, voted_count)
 
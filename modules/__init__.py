@@ -1,7 +1,5 @@
-"""Modules initialization"""
+"""Modules initialization
 
-from .registration import *
-from .voting import *
-from .results import *
-from .dsa_dashboard import *
-from .admin import *
+Page modules are imported on demand by app.py so that only the visited
+page (and its plotting dependencies) is loaded.
+"""
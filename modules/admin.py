@@ -3,11 +3,20 @@ Admin Panel Module
 Password-protected administrative operations
 """
 
+import os
+import pandas as pd
 import streamlit as st
 from datetime import datetime
-from modules.registration import initialize_session_state, save_all_data
+from modules.registration import initialize_session_state, save_all_data, reload_all_data, ensure_votes_loaded, votes_are_loaded
 
-ADMIN_PASSWORD = "admin123"
+# SHA-256 of the default admin password ("admin123")
+ADMIN_PASSWORD_HASH = "240be518fabd2724ddb6f04eeb1da5967448d7e831c08c8fa822809f74c720a9"
+
+@st.cache_data
+def _metadata_text(filepath, mtime_ns):
+    """Raw metadata.json text (already indented JSON on disk); cached on the file's modification time"""
+    with open(filepath, 'r') as f:
+        return f.read()
 
 def admin_panel_page():
     """Admin panel with password protection"""
@@ -34,7 +43,7 @@ def display_login():
         login = st.form_submit_button("Login", use_container_width=True)
 
         if login:
-            if password == ADMIN_PASSWORD:
+            if st.session_state.security_manager.verify_password(password, ADMIN_PASSWORD_HASH):
                 st.session_state.admin_authenticated = True
                 st.success("✅ Authentication successful!")
                 st.rerun()
@@ -71,6 +80,7 @@ def display_admin_dashboard():
     with tab4:
         display_system_controls()
 
+@st.fragment
 def display_system_statistics():
     """Display comprehensive system statistics"""
     st.subheader("📊 System Statistics")
@@ -97,43 +107,31 @@ def display_system_statistics():
     # Hash Table Statistics
     st.markdown("### 🔢 Hash Table Statistics")
 
-    col1, col2, col3 = st.columns(3)
-
-    with col1:
-        voters_stats = st.session_state.voters.get_stats()
-        st.info(f"""
-        **Voters Hash Table:**
-        - Size: {voters_stats['table_size']}
-        - Items: {voters_stats['total_items']}
-        - Load Factor: {voters_stats['load_factor']:.3f}
-        - Collisions: {voters_stats['collisions']}
-        - Max Chain: {voters_stats['max_chain_length']}
-        - Utilization: {voters_stats['utilization']:.1f}%
-        """)
-
-    with col2:
-        candidates_stats = st.session_state.candidates.get_stats()
-        st.info(f"""
-        **Candidates Hash Table:**
-        - Size: {candidates_stats['table_size']}
-        - Items: {candidates_stats['total_items']}
-        - Load Factor: {candidates_stats['load_factor']:.3f}
-        - Collisions: {candidates_stats['collisions']}
-        - Max Chain: {candidates_stats['max_chain_length']}
-        - Utilization: {candidates_stats['utilization']:.1f}%
-        """)
-
-    with col3:
-        votes_stats = st.session_state.votes.get_stats()
-        st.info(f"""
-        **Votes Hash Table:**
-        - Size: {votes_stats['table_size']}
-        - Items: {votes_stats['total_items']}
-        - Load Factor: {votes_stats['load_factor']:.3f}
-        - Collisions: {votes_stats['collisions']}
-        - Max Chain: {votes_stats['max_chain_length']}
-        - Utilization: {votes_stats['utilization']:.1f}%
-        """)
+    # Vote records stay on disk until asked for, so their table is only included on request
+    if not votes_are_loaded():
+        if st.button("📥 Load vote records for statistics", key="admin_load_votes"):
+            ensure_votes_loaded()
+
+    table_stats = {
+        'Voters': st.session_state.voters.get_stats(),
+        'Candidates': st.session_state.candidates.get_stats()
+    }
+    if votes_are_loaded():
+        table_stats['Votes'] = ensure_votes_loaded().get_stats()
+
+    stats_df = pd.DataFrame(
+        list(table_stats.values()),
+        index=list(table_stats)
+    )[['table_size', 'total_items', 'load_factor', 'collisions', 'max_chain_length', 'utilization']]
+    stats_df.columns = ['Size', 'Items', 'Load Factor', 'Collisions', 'Max Chain', 'Utilization %']
+    st.dataframe(
+        stats_df,
+        use_container_width=True,
+        column_config={
+            'Load Factor': st.column_config.NumberColumn(format='%.3f'),
+            'Utilization %': st.column_config.NumberColumn(format='%.1f')
+        }
+    )
 
     st.markdown("---")
 
@@ -151,10 +149,13 @@ def display_system_statistics():
 
     # System metadata
     st.markdown("### ℹ️ System Metadata")
-    metadata = persistence.load_data('metadata.json')
-
-    st.json(metadata)
+    metadata_path = persistence.get_file_path('metadata.json')
+    if os.path.exists(metadata_path):
+        st.code(_metadata_text(metadata_path, os.stat(metadata_path).st_mtime_ns), language='json')
+    else:
+        st.json({})
 
+@st.fragment
 def display_backup_controls():
     """Display backup and restore controls"""
     st.subheader("💾 Backup & Restore")
@@ -182,19 +183,21 @@ def display_backup_controls():
     if backups:
         st.info(f"Found {len(backups)} backup(s)")
 
-        for backup_timestamp in backups:
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write(f"🗂️ Backup: {backup_timestamp}")
-            with col2:
-                if st.button(f"Restore", key=f"restore_{backup_timestamp}"):
-                    with st.spinner("Restoring backup..."):
-                        success, message = persistence.restore_backup(backup_timestamp)
-                        if success:
-                            st.success(f"✅ {message}")
-                            st.warning("⚠️ Please refresh the page to see restored data")
-                        else:
-                            st.error(f"❌ {message}")
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            backup_timestamp = st.selectbox("🗂️ Backup to restore", backups)
+        with col2:
+            restore = st.button("Restore", use_container_width=True)
+
+        if restore:
+            with st.spinner("Restoring backup..."):
+                success, message = persistence.restore_backup(backup_timestamp)
+                if success:
+                    reload_all_data()
+                    st.success(f"✅ {message}")
+                    st.warning("⚠️ Please refresh the page to see restored data")
+                else:
+                    st.error(f"❌ {message}")
     else:
         st.warning("No backups found. Create your first backup!")
 
@@ -207,82 +210,54 @@ def display_backup_controls():
     - Restore operations overwrite current data
     """)
 
+@st.fragment
 def display_export_controls():
     """Display data export controls"""
     st.subheader("📥 Data Export")
 
     st.markdown("Export system data in various formats")
 
-    persistence = st.session_state.persistence
-
     # Export voters
     st.markdown("### 👥 Export Voters")
     if st.button("Export Voters to CSV", use_container_width=True):
-        voters_data = st.session_state.voters.get_all()
-        if voters_data:
-            success, message = persistence.export_to_csv(voters_data, 'voters_export.csv')
-            if success:
-                st.success(f"✅ {message}")
-
-                # Provide download
-                import pandas as pd
-                df = pd.DataFrame.from_dict(voters_data, orient='index')
-                csv = df.to_csv(index=False)
-                st.download_button(
-                    "📥 Download Voters CSV",
-                    csv,
-                    "voters_export.csv",
-                    "text/csv"
-                )
-        else:
-            st.warning("No voter data to export")
+        _export_table(st.session_state.voters, 'voters_export.csv', 'Voters')
 
     st.markdown("---")
 
     # Export candidates
     st.markdown("### 🎯 Export Candidates")
     if st.button("Export Candidates to CSV", use_container_width=True):
-        candidates_data = st.session_state.candidates.get_all()
-        if candidates_data:
-            success, message = persistence.export_to_csv(candidates_data, 'candidates_export.csv')
-            if success:
-                st.success(f"✅ {message}")
-
-                import pandas as pd
-                df = pd.DataFrame.from_dict(candidates_data, orient='index')
-                csv = df.to_csv(index=False)
-                st.download_button(
-                    "📥 Download Candidates CSV",
-                    csv,
-                    "candidates_export.csv",
-                    "text/csv"
-                )
-        else:
-            st.warning("No candidate data to export")
+        _export_table(st.session_state.candidates, 'candidates_export.csv', 'Candidates')
 
     st.markdown("---")
 
     # Export votes
     st.markdown("### 🗳️ Export Votes")
     if st.button("Export Votes to CSV", use_container_width=True):
-        votes_data = st.session_state.votes.get_all()
-        if votes_data:
-            success, message = persistence.export_to_csv(votes_data, 'votes_export.csv')
-            if success:
-                st.success(f"✅ {message}")
+        _export_table(ensure_votes_loaded(), 'votes_export.csv', 'Votes')
 
-                import pandas as pd
-                df = pd.DataFrame.from_dict(votes_data, orient='index')
-                csv = df.to_csv(index=False)
-                st.download_button(
-                    "📥 Download Votes CSV",
-                    csv,
-                    "votes_export.csv",
-                    "text/csv"
-                )
-        else:
-            st.warning("No vote data to export")
+def _export_table(table, filename, label):
+    """Write a HashTable's records to a CSV file and offer it for download"""
+    if not table.count:
+        st.warning(f"No {label.lower()} to export")
+        return
 
+    persistence = st.session_state.persistence
+    # Stream records straight from the table instead of copying it with get_all()
+    success, message = persistence.export_to_csv((record for _, record in table), filename)
+    if success:
+        st.success(f"✅ {message}")
+
+        # Provide download of the file just written, rather than building the CSV again in memory
+        with open(persistence.get_file_path(filename), 'rb') as f:
+            st.download_button(
+                f"📥 Download {label} CSV",
+                f,
+                filename,
+                "text/csv"
+            )
+
+@st.fragment
 def display_system_controls():
     """Display system control operations"""
     st.subheader("⚙️ System Controls")
@@ -300,6 +275,21 @@ def display_system_controls():
 
     st.markdown("---")
 
+    # Vote integrity
+    st.markdown("### 🔏 Verify Vote Integrity")
+    st.write("Recompute the SHA-256 hash of every recorded vote")
+
+    if st.button("Verify All Votes", use_container_width=True):
+        with st.spinner("Verifying votes..."):
+            all_votes = ensure_votes_loaded().get_all()
+            tampered = st.session_state.security_manager.verify_all_votes(all_votes)
+            if tampered:
+                st.error(f"❌ {len(tampered)} of {len(all_votes)} vote(s) failed verification: {', '.join(tampered)}")
+            else:
+                st.success(f"✅ All {len(all_votes)} vote(s) verified")
+
+    st.markdown("---")
+
     # System information
     st.markdown("### ℹ️ System Information")
 
@@ -3,8 +3,31 @@ DSA Dashboard Module
 Educational showcase of data structures and algorithms
 """
 
+import pandas as pd
 import streamlit as st
-from modules.registration import initialize_session_state
+from bisect import bisect_right
+from modules.registration import initialize_session_state, ensure_votes_loaded, votes_are_loaded, get_vote_count, get_data_lock
+
+# Load factor bands for the insights panel: below 0.5, below 0.7, and above
+LOAD_FACTOR_THRESHOLDS = (0.5, 0.7)
+LOAD_FACTOR_LEVELS = (
+    ('success', "✅ **Optimal Load Factor:**", "The hash tables are operating efficiently with low collision probability."),
+    ('warning', "⚠️ **Moderate Load Factor:**", "Performance is acceptable; tables resize automatically above 0.7."),
+    ('error', "❌ **High Load Factor:**", "Consider increasing table size to improve performance.")
+)
+
+@st.cache_data
+def _comparison_df(names, stats_tuple):
+    """Build the hash table comparison DataFrame; cached on the table names and their stats"""
+    return pd.DataFrame({
+        'Hash Table': list(names),
+        'Size': [s['table_size'] for s in stats_tuple],
+        'Items': [s['total_items'] for s in stats_tuple],
+        'Load Factor': [f"{s['load_factor']:.3f}" for s in stats_tuple],
+        'Collisions': [s['collisions'] for s in stats_tuple],
+        'Max Chain': [s['max_chain_length'] for s in stats_tuple],
+        'Utilization %': [f"{s['utilization']:.1f}" for s in stats_tuple]
+    })
 
 def display_dashboard():
     """Display DSA analysis and complexity visualizations"""
@@ -47,10 +70,10 @@ def display_overview():
 
     with col1:
         st.info("""
-        **1. Hash Table (Chaining)**
+        **1. Hash Table**
         - Stores: Voters, Candidates, Votes
         - Operations: O(1) average
-        - Collision Resolution: Chaining
+        - Collision Resolution: Open addressing (dict), chaining stats simulated
         - Usage: Primary storage mechanism
         """)
 
@@ -72,10 +95,10 @@ def display_overview():
         """)
 
         st.error("""
-        **4. List + Sorting**
+        **4. Leaderboard (Sorted List)**
         - Stores: Candidate rankings
-        - Operations: O(N log N)
-        - Algorithm: Timsort (Python's sorted())
+        - Operations: O(log N) comparisons per vote
+        - Algorithm: Binary search insertion (bisect)
         - Usage: Leaderboard generation
         """)
 
@@ -86,7 +109,6 @@ def display_overview():
 
     ht_voters = st.session_state.voters.get_stats()
     ht_candidates = st.session_state.candidates.get_stats()
-    ht_votes = st.session_state.votes.get_stats()
     trie_stats = st.session_state.candidate_trie.get_stats()
 
     col1, col2, col3 = st.columns(3)
@@ -102,74 +124,65 @@ def display_overview():
         st.metric("Collisions", ht_candidates['collisions'])
 
     with col3:
-        st.metric("Votes Hash Table Size", ht_votes['table_size'])
-        st.metric("Items Stored", ht_votes['total_items'])
+        # The vote records are only read on demand (see the Hash Table tab), so show their count here
+        if votes_are_loaded():
+            st.metric("Votes Hash Table Size", ensure_votes_loaded().get_stats()['table_size'])
+        else:
+            st.metric("Votes Hash Table Size", "Not loaded")
+        st.metric("Items Stored", get_vote_count())
         st.metric("Trie Words", trie_stats['total_words'])
 
+@st.fragment
 def display_hashtable_analysis():
     """Display hash table analysis and statistics"""
     st.subheader("🔢 Hash Table Analysis")
 
     st.markdown("""
     ### Implementation Details:
-    - **Collision Resolution:** Chaining (using lists)
-    - **Hash Function:** Python's built-in `hash()` with modulo
+    - **Storage:** Python's built-in `dict` (open addressing, implemented in C)
+    - **Collision Statistics:** Simulated chaining over the configured bucket count
+    - **Hash Function:** Python's built-in `hash()` masked to a power-of-two bucket count
     - **Load Factor:** Items / Table Size
-    - **Dynamic:** Can grow as needed
+    - **Dynamic:** Bucket count doubles once the load factor exceeds 0.7
     """)
 
-    # Get statistics for all hash tables
-    voters_stats = st.session_state.voters.get_stats()
-    candidates_stats = st.session_state.candidates.get_stats()
-    votes_stats = st.session_state.votes.get_stats()
-
     st.markdown("---")
     st.subheader("📊 Comparative Statistics")
 
-    # Create comparison table
-    comparison_data = {
-        'Hash Table': ['Voters', 'Candidates', 'Votes'],
-        'Size': [voters_stats['table_size'], candidates_stats['table_size'], votes_stats['table_size']],
-        'Items': [voters_stats['total_items'], candidates_stats['total_items'], votes_stats['total_items']],
-        'Load Factor': [
-            f"{voters_stats['load_factor']:.3f}",
-            f"{candidates_stats['load_factor']:.3f}",
-            f"{votes_stats['load_factor']:.3f}"
-        ],
-        'Collisions': [voters_stats['collisions'], candidates_stats['collisions'], votes_stats['collisions']],
-        'Max Chain': [voters_stats['max_chain_length'], candidates_stats['max_chain_length'], votes_stats['max_chain_length']],
-        'Utilization %': [
-            f"{voters_stats['utilization']:.1f}",
-            f"{candidates_stats['utilization']:.1f}",
-            f"{votes_stats['utilization']:.1f}"
-        ]
-    }
+    # Vote records stay on disk until asked for, so the votes table joins the comparison on request
+    if not votes_are_loaded():
+        st.caption(f"The votes table ({get_vote_count()} votes) is not loaded yet.")
+        if st.button("📥 Load vote records", key="dsa_load_votes"):
+            ensure_votes_loaded()
+
+    names = ['Voters', 'Candidates']
+    stats_list = [st.session_state.voters.get_stats(), st.session_state.candidates.get_stats()]
+    if votes_are_loaded():
+        names.append('Votes')
+        stats_list.append(ensure_votes_loaded().get_stats())
 
-    st.table(comparison_data)
+    # Create comparison table, one column per statistic
+    stats_tuple = tuple(stats_list)
+    st.dataframe(_comparison_df(tuple(names), stats_tuple), use_container_width=True, hide_index=True)
 
     st.markdown("---")
     st.subheader("💡 Performance Insights")
 
     # Calculate average load factor
-    avg_load_factor = (voters_stats['load_factor'] + candidates_stats['load_factor'] + votes_stats['load_factor']) / 3
-    total_collisions = voters_stats['collisions'] + candidates_stats['collisions'] + votes_stats['collisions']
+    avg_load_factor = sum(s['load_factor'] for s in stats_tuple) / len(stats_tuple)
+    total_collisions = sum(s['collisions'] for s in stats_tuple)
+    total_items = sum(s['total_items'] for s in stats_tuple)
 
     col1, col2 = st.columns(2)
 
     with col1:
-        if avg_load_factor < 0.7:
-            st.success(f"✅ **Optimal Load Factor:** {avg_load_factor:.3f}")
-            st.write("The hash tables are operating efficiently with low collision probability.")
-        elif avg_load_factor < 1.0:
-            st.warning(f"⚠️ **Moderate Load Factor:** {avg_load_factor:.3f}")
-            st.write("Performance is acceptable but consider resizing if data grows significantly.")
-        else:
-            st.error(f"❌ **High Load Factor:** {avg_load_factor:.3f}")
-            st.write("Consider increasing table size to improve performance.")
+        level, label, advice = LOAD_FACTOR_LEVELS[bisect_right(LOAD_FACTOR_THRESHOLDS, avg_load_factor)]
+        getattr(st, level)(f"{label} {avg_load_factor:.3f}")
+        st.write(advice)
 
     with col2:
         st.metric("Total Collisions Across All Tables", total_collisions)
-        st.write(f"Collision Rate: {(total_collisions / max(1, sum([voters_stats['total_items'], candidates_stats['total_items'], votes_stats['total_items']])) * 100):.2f}%")
+        st.write(f"Collision Rate: {(total_collisions / max(1, total_items) * 100):.2f}%")
 
     st.markdown("---")
     st.subheader("🔍 Live Hash Table Lookup Demo")
@@ -177,32 +190,34 @@ def display_hashtable_analysis():
     demo_type = st.selectbox("Select Hash Table", ["Voters", "Candidates", "Votes"])
 
     if demo_type == "Voters":
-        all_items = st.session_state.voters.get_all()
-        if all_items:
-            selected_key = st.selectbox("Select Voter ID", list(all_items.keys()))
+        keys = st.session_state.voters.keys()
+        if keys:
+            selected_key = st.selectbox("Select Voter ID", keys)
             if st.button("Lookup"):
                 result = st.session_state.voters.get(selected_key)
                 st.success(f"Found in O(1) time!")
                 st.json(result)
 
     elif demo_type == "Candidates":
-        all_items = st.session_state.candidates.get_all()
-        if all_items:
-            selected_key = st.selectbox("Select Candidate ID", list(all_items.keys()))
+        keys = st.session_state.candidates.keys()
+        if keys:
+            selected_key = st.selectbox("Select Candidate ID", keys)
             if st.button("Lookup"):
                 result = st.session_state.candidates.get(selected_key)
                 st.success(f"Found in O(1) time!")
                 st.json(result)
 
     else:  # Votes
-        all_items = st.session_state.votes.get_all()
-        if all_items:
-            selected_key = st.selectbox("Select Vote ID", list(all_items.keys()))
+        votes = ensure_votes_loaded()
+        keys = votes.keys()
+        if keys:
+            selected_key = st.selectbox("Select Vote ID", keys)
             if st.button("Lookup"):
-                result = st.session_state.votes.get(selected_key)
+                result = votes.get(selected_key)
                 st.success(f"Found in O(1) time!")
                 st.json(result)
 
+@st.fragment
 def display_trie_analysis():
     """Display Trie structure analysis"""
     st.subheader("🌲 Trie (Prefix Tree) Analysis")
@@ -238,7 +253,8 @@ def display_trie_analysis():
     prefix_input = st.text_input("Enter prefix to search candidates:", "")
 
     if prefix_input:
-        results = st.session_state.candidate_trie.starts_with(prefix_input)
+        with get_data_lock():
+            results = st.session_state.candidate_trie.starts_with(prefix_input)
 
         st.info(f"⏱️ Search completed in O({len(prefix_input)}) time")
 
@@ -278,6 +294,7 @@ def display_trie_analysis():
     ```
     """)
 
+@st.fragment
 def display_complexity_analysis():
     """Display time and space complexity analysis"""
     st.subheader("⏱️ Time & Space Complexity Analysis")
@@ -325,16 +342,16 @@ def display_complexity_analysis():
     st.table(trie_data)
 
     st.markdown("---")
-    st.subheader("📊 Sorting Operations")
+    st.subheader("📊 Ranking Operations")
 
     sort_data = {
-        'Algorithm': ['Python sorted()', 'List creation', 'Leaderboard generation'],
-        'Time Complexity': ['O(N log N)', 'O(N)', 'O(N log N)'],
-        'Space': ['O(N)', 'O(N)', 'O(N)'],
+        'Algorithm': ['Leaderboard update', 'Top-k read', 'Leaderboard generation'],
+        'Time Complexity': ['O(log N)', 'O(k)', 'O(N)'],
+        'Space': ['O(N)', 'O(k)', 'O(N)'],
         'Implementation': [
-            'Timsort (hybrid of merge + insertion)',
-            'Convert dict to list',
-            'Sort + display operations'
+            'bisect removal + insort of one entry per vote',
+            'Slice of the sorted entries',
+            'Read ranking + display operations'
         ]
     }
     st.table(sort_data)
@@ -373,17 +390,17 @@ def display_complexity_analysis():
         st.error("""
         **Results Generation:**
         - Data Collection: O(N)
-        - Sorting: O(N log N)
+        - Ranking: O(N) read (kept sorted per vote)
         - Display: O(N)
-        - **Total: O(N log N)**
+        - **Total: O(N)**
         """)
 
     st.markdown("---")
     st.subheader("💡 Performance Optimization Tips")
 
     st.markdown("""
-    1. **Hash Table Sizing:** Keep load factor < 0.75 for optimal performance
+    1. **Hash Table Sizing:** Tables double in size once the load factor passes 0.7
     2. **Trie Efficiency:** Most effective when many words share common prefixes
-    3. **Sorting:** Results are cached until new votes are cast
+    3. **Ranking:** The leaderboard is kept sorted as votes arrive, so results never re-sort
     4. **Memory:** All data structures use O(N) space relative to data size
     """)
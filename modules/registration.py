@@ -4,61 +4,154 @@ Handles voter and candidate registration
 """
 
 import streamlit as st
-from core.data_structures import HashTable, Trie
+from threading import Lock, RLock
+from types import SimpleNamespace
+from core.data_structures import HashTable, Trie, Leaderboard
 from core.security import SecurityManager
 from core.persistence import DataPersistence
 from core import utils
 
+@st.cache_resource
+def get_persistence():
+    """Shared DataPersistence instance, created once per server process"""
+    return DataPersistence('e_voting_system/data')
+
+# Vote state is mutated in place on the shared object, so sessions never hold their own copies
+_SHARED_ONLY = ('votes', 'votes_loaded', 'vote_count', 'votes_lock', 'data_lock')
+
+@st.cache_resource
+def _build_state():
+    """Create the in-memory data structures and load them from disk, once per server process"""
+    state = SimpleNamespace(
+        voters=HashTable(size=200),
+        candidates=HashTable(size=100),
+        votes=HashTable(size=500),
+        candidate_trie=Trie(),
+        candidate_ranking=Leaderboard(),
+        voted_set=set(),
+        # lowercased email -> voter_id and lowercased name -> candidate_id, for O(1) duplicate checks
+        email_index={},
+        name_index={},
+        # voter_id -> (lowercased name, lowercased email), scanned by search_voters
+        voter_search_text={},
+        # Vote records are read from disk on first use (see ensure_votes_loaded);
+        # vote_count is kept current either way and numbers new votes. votes_lock guards all three.
+        votes_loaded=False,
+        vote_count=0,
+        votes_lock=Lock(),
+        # Held across every change to the shared voters, candidates, indexes, tries, ranking and
+        # voted set (e.g. the already-voted check and recording the vote); readers that walk the
+        # indexes or tries hold it too, so no session iterates a structure another is growing
+        data_lock=RLock(),
+        security_manager=SecurityManager(),
+        persistence=get_persistence()
+    )
+    load_all_data(state)
+    return state
+
 def initialize_session_state():
-    """Initialize session state variables"""
-    if 'voters' not in st.session_state:
-        st.session_state.voters = HashTable(size=200)
-    if 'candidates' not in st.session_state:
-        st.session_state.candidates = HashTable(size=100)
-    if 'votes' not in st.session_state:
-        st.session_state.votes = HashTable(size=500)
-    if 'candidate_trie' not in st.session_state:
-        st.session_state.candidate_trie = Trie()
-    if 'voted_set' not in st.session_state:
-        st.session_state.voted_set = set()
-    if 'security_manager' not in st.session_state:
-        st.session_state.security_manager = SecurityManager()
-    if 'persistence' not in st.session_state:
-        st.session_state.persistence = DataPersistence('e_voting_system/data')
-    if 'data_loaded' not in st.session_state:
-        load_all_data()
-        st.session_state.data_loaded = True
-
-def load_all_data():
-    """Load all data from JSON files into memory"""
-    persistence = DataPersistence('e_voting_system/data')
+    """Point this session at the current shared application state
+
+    The shared namespace itself is remembered in the session, so every session picks up
+    a rebuilt state (e.g. after a restore) on its next rerun instead of keeping stale tables.
+    """
+    state = _build_state()
+    if st.session_state.get('_state') is not state:
+        # cache_resource hands back the same objects (no copy), so this is a handful of reference assignments
+        for name, value in vars(state).items():
+            if name not in _SHARED_ONLY:
+                st.session_state[name] = value
+        st.session_state._state = state
+
+def reload_all_data():
+    """Drop the shared state so every session rebuilds it from disk on its next rerun"""
+    _build_state.clear()
+
+def index_voter(state, voter_id, voter_info):
+    """Add a voter to the duplicate-email index and the search text"""
+    email = voter_info['email'].lower()
+    state.email_index[email] = voter_id
+    state.voter_search_text[voter_id] = (voter_info['name'].lower(), email)
+
+def search_voters(state, term):
+    """Return IDs of voters whose name or email contains term, in registration order"""
+    term = term.lower()
+    with get_data_lock():
+        return [
+            voter_id for voter_id, (name, email) in state.voter_search_text.items()
+            if term in name or term in email
+        ]
+
+def load_all_data(state):
+    """Load all data from JSON files into the given state"""
+    persistence = state.persistence
     persistence.initialize_default_files()
 
     # Load voters
     voters_data = persistence.load_data('voters.json')
+    state.voters.bulk_insert(voters_data.items())
+    state.voted_set.update(voter_id for voter_id, voter_info in voters_data.items() if voter_info.get('has_voted', False))
     for voter_id, voter_info in voters_data.items():
-        st.session_state.voters.insert(voter_id, voter_info)
-        if voter_info.get('has_voted', False):
-            st.session_state.voted_set.add(voter_id)
+        index_voter(state, voter_id, voter_info)
 
     # Load candidates
     candidates_data = persistence.load_data('candidates.json')
+    state.candidates.bulk_insert(candidates_data.items())
     for candidate_id, candidate_info in candidates_data.items():
-        st.session_state.candidates.insert(candidate_id, candidate_info)
-        st.session_state.candidate_trie.insert(candidate_info['name'], candidate_info)
-
-    # Load votes
-    votes_data = persistence.load_data('votes.json')
-    for vote_id, vote_info in votes_data.items():
-        st.session_state.votes.insert(vote_id, vote_info)
+        state.name_index[candidate_info['name'].lower()] = candidate_id
+        state.candidate_trie.insert(candidate_info['name'], candidate_info)
+        state.candidate_ranking.update(candidate_id, candidate_info.get('votes', 0))
+
+    # Only the vote count is needed at startup; the records stay on disk until something reads them
+    state.vote_count = persistence.count_records('votes.json')
+
+def ensure_votes_loaded():
+    """Return the shared votes table, reading the vote records from disk the first time"""
+    state = _build_state()
+    with state.votes_lock:
+        if not state.votes_loaded:
+            state.votes.bulk_insert(state.persistence.load_data('votes.json').items())
+            state.votes_loaded = True
+    return state.votes
+
+def votes_are_loaded():
+    """Whether the vote records have been read into the votes table yet"""
+    return _build_state().votes_loaded
+
+def get_data_lock():
+    """Lock to hold while changing the shared tables and indexes, or walking the indexes and tries"""
+    return _build_state().data_lock
+
+def get_vote_count():
+    """Number of votes cast, without loading the vote records"""
+    return _build_state().vote_count
+
+def store_vote(vote_data):
+    """Number a new vote, persist it, and add it to the votes table if that is loaded; returns the vote ID"""
+    state = _build_state()
+    with state.votes_lock:
+        state.vote_count += 1
+        vote_id = f"VOTE_{state.vote_count}"
+        # An unloaded table picks the vote up from the change log when it is first read
+        if state.votes_loaded:
+            state.votes.insert(vote_id, vote_data)
+        state.persistence.append_record('votes.json', vote_id, vote_data)
+    return vote_id
 
 def save_all_data():
-    """Save all data from memory to JSON files"""
-    persistence = st.session_state.persistence
-
-    persistence.save_data('voters.json', st.session_state.voters.to_dict())
-    persistence.save_data('candidates.json', st.session_state.candidates.to_dict())
-    persistence.save_data('votes.json', st.session_state.votes.to_dict())
+    """Save all data from the current shared state to JSON files"""
+    # Read from the shared state rather than this session's references, which may predate a restore
+    state = _build_state()
+    persistence = state.persistence
+
+    persistence.save_data('voters.json', state.voters.to_dict())
+    persistence.save_data('candidates.json', state.candidates.to_dict())
+    # Unloaded votes are already on disk; just fold their change log into votes.json
+    with state.votes_lock:
+        if state.votes_loaded:
+            persistence.save_data('votes.json', state.votes.to_dict())
+        else:
+            persistence.compact('votes.json')
 
 def display_home():
     """Display home page with statistics"""
@@ -67,11 +160,13 @@ def display_home():
     st.header("🏠 Welcome to AI-Integrated E-Voting System")
     st.markdown("### System Overview")
 
-    # Get statistics
+    # Get statistics; the tables only need their sizes and the voted set gives the voted count
+    all_candidates = st.session_state.candidates.get_all()
     stats = utils.get_system_stats(
-        st.session_state.voters.get_all(),
-        st.session_state.candidates.get_all(),
-        st.session_state.votes.get_all()
+        st.session_state.voters,
+        all_candidates,
+        voted_count=len(st.session_state.voted_set),
+        total_votes=get_vote_count()
     )
 
     # Display metrics
@@ -122,9 +217,10 @@ def display_home():
     # Top candidates
     if stats['total_candidates'] > 0:
         st.subheader("🏆 Current Leaders")
-        top_3 = utils.get_top_n_candidates(st.session_state.candidates.get_all(), 3)
+        top_3 = st.session_state.candidate_ranking.top(3)
 
-        for rank, (cid, data) in enumerate(top_3, 1):
+        for rank, cid in enumerate(top_3, 1):
+            data = all_candidates[cid]
             medal = "🥇" if rank == 1 else "🥈" if rank == 2 else "🥉"
             st.success(f"{medal} **{data['name']}** ({data['party']}) - {data['votes']} votes")
 
@@ -161,24 +257,25 @@ def voter_registration_page():
             elif not utils.validate_age(age):
                 st.error("❌ You must be at least 18 years old to register")
             else:
-                # Check duplicate email
-                all_voters = st.session_state.voters.get_all()
-                email_exists = any(v['email'] == email.lower() for v in all_voters.values())
-
-                if email_exists:
+                # Check duplicate email and register under one lock, so two sessions cannot both pass the check
+                with get_data_lock():
+                    duplicate = email.lower() in st.session_state.email_index
+                    if not duplicate:
+                        # Generate voter ID
+                        security = st.session_state.security_manager
+                        voter_id = security.generate_voter_id()
+
+                        # Format and save voter data
+                        voter_data = utils.format_voter_data(name, age, email, voter_id)
+                        st.session_state.voters.insert(voter_id, voter_data)
+                        index_voter(st.session_state, voter_id, voter_data)
+
+                        # Persist just the new record
+                        st.session_state.persistence.append_record('voters.json', voter_id, voter_data)
+
+                if duplicate:
                     st.error("❌ This email is already registered")
                 else:
-                    # Generate voter ID
-                    security = st.session_state.security_manager
-                    voter_id = security.generate_voter_id()
-
-                    # Format and save voter data
-                    voter_data = utils.format_voter_data(name, age, email, voter_id)
-                    st.session_state.voters.insert(voter_id, voter_data)
-
-                    # Save to file
-                    save_all_data()
-
                     st.success("✅ Voter registered successfully!")
                     st.info(f"**Your Voter ID:** `{voter_id}`")
                     st.warning("⚠️ Please save this ID. You'll need it to cast your vote.")
@@ -187,24 +284,29 @@ def voter_registration_page():
     st.markdown("---")
     st.subheader("👥 Registered Voters")
 
-    all_voters = st.session_state.voters.get_all()
+    all_voters = st.session_state.voters.items()
     if all_voters:
         st.info(f"Total Registered Voters: {len(all_voters)}")
 
         # Search functionality
         search_term = st.text_input("🔍 Search by name or email", "")
 
+        if search_term:
+            voters = st.session_state.voters
+            matching_voters = [(voter_id, voters.get(voter_id)) for voter_id in search_voters(st.session_state, search_term)]
+        else:
+            matching_voters = all_voters
+
         voters_list = []
-        for voter_id, voter_data in all_voters.items():
-            if search_term.lower() in voter_data['name'].lower() or search_term.lower() in voter_data['email'].lower():
-                voters_list.append({
-                    'Voter ID': voter_id,
-                    'Name': voter_data['name'],
-                    'Age': voter_data['age'],
-                    'Email': voter_data['email'],
-                    'Status': '✅ Voted' if voter_data.get('has_voted', False) else '⏳ Pending',
-                    'Registered': voter_data['registered_at']
-                })
+        for voter_id, voter_data in matching_voters:
+            voters_list.append({
+                'Voter ID': voter_id,
+                'Name': voter_data['name'],
+                'Age': voter_data['age'],
+                'Email': voter_data['email'],
+                'Status': '✅ Voted' if voter_data.get('has_voted', False) else '⏳ Pending',
+                'Registered': voter_data['registered_at']
+            })
 
         if voters_list:
             st.dataframe(voters_list, use_container_width=True, hide_index=True)
@@ -237,25 +339,27 @@ def candidate_registration_page():
             elif not utils.validate_name(name):
                 st.error("❌ Name should contain only letters and spaces")
             else:
-                # Check duplicate name
-                all_candidates = st.session_state.candidates.get_all()
-                name_exists = any(c['name'].lower() == name.lower() for c in all_candidates.values())
-
-                if name_exists:
+                # Check duplicate name and register under one lock, so two sessions cannot both pass the check
+                with get_data_lock():
+                    duplicate = name.lower() in st.session_state.name_index
+                    if not duplicate:
+                        # Generate candidate ID
+                        security = st.session_state.security_manager
+                        candidate_id = security.generate_candidate_id()
+
+                        # Format and save candidate data
+                        candidate_data = utils.format_candidate_data(name, party, candidate_id)
+                        st.session_state.candidates.insert(candidate_id, candidate_data)
+                        st.session_state.name_index[candidate_data['name'].lower()] = candidate_id
+                        st.session_state.candidate_trie.insert(name, candidate_data)
+                        st.session_state.candidate_ranking.update(candidate_id, candidate_data['votes'])
+
+                        # Persist just the new record
+                        st.session_state.persistence.append_record('candidates.json', candidate_id, candidate_data)
+
+                if duplicate:
                     st.error("❌ A candidate with this name is already registered")
                 else:
-                    # Generate candidate ID
-                    security = st.session_state.security_manager
-                    candidate_id = security.generate_candidate_id()
-
-                    # Format and save candidate data
-                    candidate_data = utils.format_candidate_data(name, party, candidate_id)
-                    st.session_state.candidates.insert(candidate_id, candidate_data)
-                    st.session_state.candidate_trie.insert(name, candidate_data)
-
-                    # Save to file
-                    save_all_data()
-
                     st.success(f"✅ Candidate registered successfully!")
                     st.info(f"**Candidate ID:** `{candidate_id}`")
 
@@ -263,7 +367,7 @@ def candidate_registration_page():
     st.markdown("---")
     st.subheader("🎯 Registered Candidates")
 
-    all_candidates = st.session_state.candidates.get_all()
+    all_candidates = st.session_state.candidates.items()
     if all_candidates:
         st.info(f"Total Registered Candidates: {len(all_candidates)}")
 
@@ -271,7 +375,8 @@ def candidate_registration_page():
         search_prefix = st.text_input("🔍 Search by name prefix (using Trie)", "")
 
         if search_prefix:
-            results = st.session_state.candidate_trie.starts_with(search_prefix)
+            with get_data_lock():
+                results = st.session_state.candidate_trie.starts_with(search_prefix)
             if results:
                 st.success(f"Found {len(results)} candidate(s) matching '{search_prefix}'")
                 for result in results:
@@ -282,7 +387,7 @@ def candidate_registration_page():
 
         # Display all candidates
         candidates_list = []
-        for candidate_id, candidate_data in all_candidates.items():
+        for candidate_id, candidate_data in all_candidates:
             candidates_list.append({
                 'Candidate ID': candidate_id,
                 'Name': candidate_data['name'],
@@ -3,11 +3,11 @@ Results Module
 Handles election results, analytics, and visualizations
 """
 
+import pandas as pd
 import streamlit as st
 import plotly.graph_objects as go
-import plotly.express as px
 from core import utils
-from modules.registration import initialize_session_state
+from modules.registration import initialize_session_state, get_vote_count
 
 def results_dashboard():
     """Display election results and analytics"""
@@ -15,20 +15,23 @@ def results_dashboard():
 
     st.header("📊 Election Results & Analytics")
 
-    all_candidates = st.session_state.candidates.get_all()
-    all_voters = st.session_state.voters.get_all()
-    all_votes = st.session_state.votes.get_all()
+    candidates = st.session_state.candidates
 
-    if not all_candidates:
+    if not candidates.count:
         st.warning("⚠️ No candidates registered yet")
         return
 
     # Calculate statistics
-    total_votes = len(all_votes)
-    total_voters = len(all_voters)
+    total_votes = get_vote_count()
+    total_voters = len(st.session_state.voters)
     voted_count = len(st.session_state.voted_set)
     turnout = utils.calculate_turnout(total_voters, voted_count)
 
+    # The ranking is maintained on every registration and vote, so reading it needs no sort
+    sorted_candidates = [(cid, candidates.get(cid)) for cid in st.session_state.candidate_ranking.top()]
+    # Vote shares in ranking order, computed once for the leaderboard and the detailed table
+    percentages = utils.calculate_vote_percentages([data['votes'] for _, data in sorted_candidates], total_votes)
+
     # Display key metrics
     col1, col2, col3, col4 = st.columns(4)
 
@@ -39,14 +42,14 @@ def results_dashboard():
     with col3:
         st.metric("📊 Turnout", f"{turnout}%")
     with col4:
-        winner = get_winner(all_candidates)
+        winner = get_winner(sorted_candidates)
         st.metric("🏆 Leading", winner['name'] if winner else "N/A")
 
     st.markdown("---")
 
     # Leaderboard Section
     st.subheader("🏆 Leaderboard")
-    display_leaderboard(all_candidates, total_votes)
+    display_leaderboard(sorted_candidates, total_votes, percentages)
 
     st.markdown("---")
 
@@ -55,17 +58,17 @@ def results_dashboard():
 
     with col1:
         st.subheader("📊 Vote Distribution")
-        plot_vote_distribution(all_candidates)
+        plot_vote_distribution(sorted_candidates)
 
     with col2:
         st.subheader("🥧 Vote Share")
-        plot_vote_pie_chart(all_candidates, total_votes)
+        plot_vote_pie_chart(sorted_candidates, total_votes)
 
     st.markdown("---")
 
     # Detailed Results Table
     st.subheader("📋 Detailed Results")
-    display_detailed_results(all_candidates, total_votes)
+    display_detailed_results(sorted_candidates, percentages)
 
     st.markdown("---")
 
@@ -73,10 +76,8 @@ def results_dashboard():
     st.subheader("📈 Turnout Analysis")
     display_turnout_analysis(total_voters, voted_count, turnout)
 
-def display_leaderboard(candidates_dict, total_votes):
-    """Display candidate leaderboard using List + Sort (O(N log N))"""
-    sorted_candidates = utils.sort_candidates_by_votes(candidates_dict)
-
+def display_leaderboard(sorted_candidates, total_votes, percentages):
+    """Display candidate leaderboard from the (candidate_id, data) list ranked by the Leaderboard"""
     if not sorted_candidates:
         st.info("No votes cast yet")
         return
@@ -85,9 +86,8 @@ def display_leaderboard(candidates_dict, total_votes):
     st.markdown("### 🥇 Top 3 Candidates")
     top_3 = sorted_candidates[:3]
 
-    for rank, (cid, data) in enumerate(top_3, 1):
+    for rank, ((cid, data), percentage) in enumerate(zip(top_3, percentages), 1):
         medal = "🥇" if rank == 1 else "🥈" if rank == 2 else "🥉"
-        percentage = utils.calculate_vote_percentage(data['votes'], total_votes)
 
         col1, col2, col3 = st.columns([3, 1, 1])
         with col1:
@@ -103,9 +103,10 @@ def display_leaderboard(candidates_dict, total_votes):
     # Full Leaderboard
     st.markdown("### 📊 Complete Rankings")
 
-    for rank, (cid, data) in enumerate(sorted_candidates, 1):
-        percentage = utils.calculate_vote_percentage(data['votes'], total_votes)
+    # The list is ranked, so the first entry holds the maximum
+    max_votes = max(1, sorted_candidates[0][1]['votes'])
 
+    for rank, ((cid, data), percentage) in enumerate(zip(sorted_candidates, percentages), 1):
         # Progress bar for votes
         col1, col2, col3, col4 = st.columns([1, 3, 1, 1])
 
@@ -120,20 +121,11 @@ def display_leaderboard(candidates_dict, total_votes):
 
         # Visual progress bar
         if total_votes > 0:
-            st.progress(data['votes'] / max(1, max(c[1]['votes'] for c in sorted_candidates)))
-
-def plot_vote_distribution(candidates_dict):
-    """Create bar chart for vote distribution using Plotly"""
-    sorted_candidates = utils.sort_candidates_by_votes(candidates_dict)
-
-    if not sorted_candidates:
-        st.info("No data to display")
-        return
-
-    names = [data['name'] for _, data in sorted_candidates]
-    votes = [data['votes'] for _, data in sorted_candidates]
-    parties = [data['party'] for _, data in sorted_candidates]
+            st.progress(data['votes'] / max_votes)
 
+@st.cache_data
+def _vote_distribution_figure(names, votes):
+    """Build the votes-per-candidate bar chart; cached on the (names, votes) tuples across reruns"""
     fig = go.Figure(data=[
         go.Bar(
             x=names,
@@ -156,24 +148,22 @@ def plot_vote_distribution(candidates_dict):
         height=400,
         showlegend=False
     )
+    return fig
 
-    st.plotly_chart(fig, use_container_width=True)
-
-def plot_vote_pie_chart(candidates_dict, total_votes):
-    """Create pie chart for vote share using Plotly"""
-    if total_votes == 0:
-        st.info("No votes cast yet")
+def plot_vote_distribution(sorted_candidates):
+    """Create bar chart for vote distribution using Plotly"""
+    if not sorted_candidates:
+        st.info("No data to display")
         return
 
-    sorted_candidates = utils.sort_candidates_by_votes(candidates_dict)
-
-    names = [data['name'] for _, data in sorted_candidates if data['votes'] > 0]
-    votes = [data['votes'] for _, data in sorted_candidates if data['votes'] > 0]
+    names = tuple(data['name'] for _, data in sorted_candidates)
+    votes = tuple(data['votes'] for _, data in sorted_candidates)
 
-    if not names:
-        st.info("No votes cast yet")
-        return
+    st.plotly_chart(_vote_distribution_figure(names, votes), use_container_width=True)
 
+@st.cache_data
+def _vote_share_figure(names, votes):
+    """Build the vote-share pie chart; cached on the (names, votes) tuples across reruns"""
     fig = go.Figure(data=[
         go.Pie(
             labels=names,
@@ -188,32 +178,42 @@ def plot_vote_pie_chart(candidates_dict, total_votes):
         title="Vote Share Distribution",
         height=400
     )
+    return fig
 
-    st.plotly_chart(fig, use_container_width=True)
+def plot_vote_pie_chart(sorted_candidates, total_votes):
+    """Create pie chart for vote share using Plotly"""
+    if total_votes == 0:
+        st.info("No votes cast yet")
+        return
 
-def display_detailed_results(candidates_dict, total_votes):
+    names = tuple(data['name'] for _, data in sorted_candidates if data['votes'] > 0)
+    votes = tuple(data['votes'] for _, data in sorted_candidates if data['votes'] > 0)
+
+    if not names:
+        st.info("No votes cast yet")
+        return
+
+    st.plotly_chart(_vote_share_figure(names, votes), use_container_width=True)
+
+def display_detailed_results(sorted_candidates, percentages):
     """Display detailed results in a sortable table"""
-    sorted_candidates = utils.sort_candidates_by_votes(candidates_dict)
-
-    results_data = []
-    for rank, (cid, data) in enumerate(sorted_candidates, 1):
-        percentage = utils.calculate_vote_percentage(data['votes'], total_votes)
-        results_data.append({
-            'Rank': rank,
-            'Candidate Name': data['name'],
-            'Party': data['party'],
-            'Votes Received': data['votes'],
-            'Vote Share (%)': percentage,
-            'Registered At': data['registered_at']
-        })
-
-    st.dataframe(results_data, use_container_width=True, hide_index=True)
+    records = [data for _, data in sorted_candidates]
+
+    # Build the table column by column; the same frame backs the CSV export
+    results_df = pd.DataFrame({
+        'Rank': range(1, len(records) + 1),
+        'Candidate Name': [data['name'] for data in records],
+        'Party': [data['party'] for data in records],
+        'Votes Received': [data['votes'] for data in records],
+        'Vote Share (%)': percentages,
+        'Registered At': [data['registered_at'] for data in records]
+    })
+
+    st.dataframe(results_df, use_container_width=True, hide_index=True)
 
     # Export option
     if st.button("📥 Export Results to CSV"):
-        import pandas as pd
-        df = pd.DataFrame(results_data)
-        csv = df.to_csv(index=False)
+        csv = results_df.to_csv(index=False)
         st.download_button(
             label="Download CSV",
             data=csv,
@@ -221,54 +221,63 @@ def display_detailed_results(candidates_dict, total_votes):
             mime="text/csv"
         )
 
+@st.cache_data
+def _turnout_gauge_figure(turnout):
+    """Build the turnout gauge; cached on the turnout percentage across reruns"""
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=turnout,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': "Voter Turnout (%)"},
+        delta={'reference': 50},
+        gauge={
+            'axis': {'range': [None, 100]},
+            'bar': {'color': "darkblue"},
+            'steps': [
+                {'range': [0, 30], 'color': "lightgray"},
+                {'range': [30, 60], 'color': "gray"},
+                {'range': [60, 100], 'color': "lightgreen"}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': 90
+            }
+        }
+    ))
+
+    fig.update_layout(height=300)
+    return fig
+
+@st.cache_data
+def _voter_status_figure(voted_count, pending_count):
+    """Build the voted vs pending pie chart; cached on the two counts across reruns"""
+    fig = go.Figure(data=[
+        go.Pie(
+            labels=['Voted', 'Pending'],
+            values=[voted_count, pending_count],
+            marker=dict(colors=['#2ecc71', '#e74c3c']),
+            hole=0.4
+        )
+    ])
+
+    fig.update_layout(
+        title="Voter Status",
+        height=300
+    )
+    return fig
+
 def display_turnout_analysis(total_voters, voted_count, turnout):
     """Display voter turnout analysis"""
     col1, col2 = st.columns(2)
 
     with col1:
         # Turnout gauge chart
-        fig = go.Figure(go.Indicator(
-            mode="gauge+number+delta",
-            value=turnout,
-            domain={'x': [0, 1], 'y': [0, 1]},
-            title={'text': "Voter Turnout (%)"},
-            delta={'reference': 50},
-            gauge={
-                'axis': {'range': [None, 100]},
-                'bar': {'color': "darkblue"},
-                'steps': [
-                    {'range': [0, 30], 'color': "lightgray"},
-                    {'range': [30, 60], 'color': "gray"},
-                    {'range': [60, 100], 'color': "lightgreen"}
-                ],
-                'threshold': {
-                    'line': {'color': "red", 'width': 4},
-                    'thickness': 0.75,
-                    'value': 90
-                }
-            }
-        ))
-
-        fig.update_layout(height=300)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(_turnout_gauge_figure(turnout), use_container_width=True)
 
     with col2:
         # Voted vs Pending pie chart
-        fig = go.Figure(data=[
-            go.Pie(
-                labels=['Voted', 'Pending'],
-                values=[voted_count, total_voters - voted_count],
-                marker=dict(colors=['#2ecc71', '#e74c3c']),
-                hole=0.4
-            )
-        ])
-
-        fig.update_layout(
-            title="Voter Status",
-            height=300
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(_voter_status_figure(voted_count, total_voters - voted_count), use_container_width=True)
 
     # Summary stats
     st.info(f"""
@@ -279,9 +288,8 @@ def display_turnout_analysis(total_voters, voted_count, turnout):
     - Turnout Percentage: {turnout}%
     """)
 
-def get_winner(candidates_dict):
-    """Get the candidate with the most votes"""
-    sorted_candidates = utils.sort_candidates_by_votes(candidates_dict)
+def get_winner(sorted_candidates):
+    """Get the candidate with the most votes from the ranked (candidate_id, data) list"""
     if sorted_candidates and sorted_candidates[0][1]['votes'] > 0:
         return sorted_candidates[0][1]
     return None
@@ -6,7 +6,7 @@ Handles vote casting and validation
 import streamlit as st
 from datetime import datetime
 from core import utils
-from modules.registration import initialize_session_state, save_all_data
+from modules.registration import initialize_session_state, store_vote, get_data_lock
 
 def cast_vote_page():
     """Vote casting page"""
@@ -50,8 +50,8 @@ def cast_vote_page():
 
         st.success(f"✅ Authenticated as: **{voter_data['name']}** (ID: {voter_id})")
 
-        # Get all candidates
-        all_candidates = st.session_state.candidates.get_all()
+        # Get all candidates (a view; the options dict below is the only copy)
+        all_candidates = st.session_state.candidates.items()
 
         if not all_candidates:
             st.warning("⚠️ No candidates are registered yet. Please try again later.")
@@ -65,7 +65,7 @@ def cast_vote_page():
 
         # Display candidates with radio buttons
         candidate_options = {}
-        for cid, cdata in all_candidates.items():
+        for cid, cdata in all_candidates:
             label = f"{cdata['name']} ({cdata['party']})"
             candidate_options[label] = cid
 
@@ -119,40 +119,46 @@ def cast_vote_page():
                         st.error("❌ Failed to record vote. Please try again.")
 
 def process_vote(voter_id, candidate_id):
-    """Process and record a vote"""
-    try:
-        # Get current timestamp
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    """Validate and record a vote, returning False (after showing an error) if it cannot be cast"""
+    voter_data = st.session_state.voters.get(voter_id)
+    candidate_data = st.session_state.candidates.get(candidate_id)
 
-        # Generate vote hash for integrity
-        security = st.session_state.security_manager
-        vote_hash = security.hash_vote(voter_id, candidate_id, timestamp)
-
-        # Create vote record
-        vote_data = utils.format_vote_data(voter_id, candidate_id, vote_hash)
-
-        # Store vote
-        vote_id = f"VOTE_{len(st.session_state.votes.get_all()) + 1}"
-        st.session_state.votes.insert(vote_id, vote_data)
-
-        # Update voter status
-        voter_data = st.session_state.voters.get(voter_id)
-        voter_data['has_voted'] = True
-        st.session_state.voters.insert(voter_id, voter_data)
-        st.session_state.voted_set.add(voter_id)
-
-        # Update candidate vote count
-        candidate_data = st.session_state.candidates.get(candidate_id)
-        candidate_data['votes'] = candidate_data.get('votes', 0) + 1
-        st.session_state.candidates.insert(candidate_id, candidate_data)
-
-        # Update Trie with new vote count
-        st.session_state.candidate_trie.insert(candidate_data['name'], candidate_data)
-
-        # Save all data
-        save_all_data()
-
-        return True
-    except Exception as e:
-        st.error(f"Error processing vote: {e}")
+    if voter_data is None or candidate_data is None:
+        st.error("Error processing vote: unknown voter or candidate")
         return False
+
+    # voted_set is shared by every session, so the check and the recording must not interleave
+    with get_data_lock():
+        if voter_id in st.session_state.voted_set:
+            st.error("Error processing vote: this voter has already voted")
+            return False
+        _record_vote(voter_id, voter_data, candidate_id, candidate_data)
+    return True
+
+def _record_vote(voter_id, voter_data, candidate_id, candidate_data):
+    """Record a validated vote in memory and append the touched records to disk; call with the data lock held"""
+    # Get current timestamp
+    timestamp = utils.current_timestamp()
+
+    # Generate vote hash for integrity
+    security = st.session_state.security_manager
+    vote_hash = security.hash_vote(voter_id, candidate_id, timestamp)
+
+    # Create vote record with the same timestamp that was hashed
+    vote_data = utils.format_vote_data(voter_id, candidate_id, vote_hash, timestamp)
+
+    # Store and persist the vote
+    store_vote(vote_data)
+
+    # Update voter status; HashTable.get returned the stored dict, so mutating it updates the table
+    voter_data['has_voted'] = True
+    st.session_state.voted_set.add(voter_id)
+
+    # Update candidate vote count in place; the table and the Trie both hold this same dict.
+    # The ranking's int64 tally is the live counter; the record mirrors it for persistence
+    candidate_data['votes'] = st.session_state.candidate_ranking.increment(candidate_id)
+
+    # Persist only the records this vote touched
+    persistence = st.session_state.persistence
+    persistence.append_record('voters.json', voter_id, voter_data)
+    persistence.append_record('candidates.json', candidate_id, candidate_data)
@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+
+from core.persistence import DataPersistence
+
+
+class ChangeLogTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.persistence = DataPersistence(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_append_after_torn_tail_keeps_record(self):
+        self.persistence.save_data('votes.json', {'VOTE_1': {'n': 1}})
+        self.persistence.append_record('votes.json', 'VOTE_2', {'n': 2})
+        # Simulate a crash half way through writing a line
+        with open(self.persistence.get_log_path('votes.json'), 'ab') as f:
+            f.write(b'["VOTE_3", {"n"')
+
+        fresh = DataPersistence(self._tmp.name)
+        fresh.append_record('votes.json', 'VOTE_4', {'n': 4})
+
+        data = fresh.load_data('votes.json')
+        self.assertEqual(sorted(data), ['VOTE_1', 'VOTE_2', 'VOTE_4'])
+        self.assertEqual(fresh.count_records('votes.json'), len(data))
+
+    def test_torn_tail_is_not_counted(self):
+        self.persistence.save_data('votes.json', {})
+        with open(self.persistence.get_log_path('votes.json'), 'wb') as f:
+            f.write(b'["VOTE_1", {"n": 1}]\n["VOTE_2"')
+        self.assertEqual(self.persistence.count_records('votes.json'), 1)
+        self.assertEqual(len(self.persistence.load_data('votes.json')), 1)
+
+
+class RecordCountTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.persistence = DataPersistence(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_count_cache_stays_out_of_metadata(self):
+        self.persistence.save_data('votes.json', {'VOTE_1': {}, 'VOTE_2': {}})
+        self.persistence.initialize_default_files()
+
+        metadata = self.persistence.load_data('metadata.json')
+        self.assertNotIn('record_counts', metadata)
+        self.assertEqual(metadata['backup_count'], 0)
+        self.assertEqual(DataPersistence(self._tmp.name).count_records('votes.json'), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()